@@ -1,5 +1,5 @@
-from copy import deepcopy
 from matplotlib import pyplot as plt
+from matplotlib.colors import to_rgba
 import matplotlib.gridspec as gridspec
 
 from pyalluv import AlluvialPlot, Cluster, Flux
@@ -19,27 +19,26 @@ between_fluxes = [
 
 # set the colors
 cluster_color = {0: "C1", 1: "C2"}
-# create a dictionary with the time points as keys and a list of clusters
-# as values
-clustering_sequence = {}
-for tp, clustering in enumerate(cluster_sizes):
-    clustering_sequence[time_points[tp]] = [
-            Cluster(
-                height=clustering[cid],
-                label="{0}".format(cid),
-                facecolor=cluster_color[cid],
-                ) for cid in clustering
-            ]
-# now create the fluxes between the clusters
-for tidx, tp in enumerate(time_points[1:]):
-    fluxes = between_fluxes[tidx]
-    for from_csid, to_csid in fluxes:
-        Flux(
-            flux=fluxes[(from_csid, to_csid)],
-            source_cluster=clustering_sequence[time_points[tidx]][from_csid],
-            target_cluster=clustering_sequence[tp][to_csid],
-            facecolor='source_cluster'
-            )
+# resolve the colors once, every cluster then gets a ready RGBA tuple
+cluster_color = {cid: to_rgba(color) for cid, color in cluster_color.items()}
+# create a list holding for each time point the list of clusters and connect
+# each new clustering to the previous one with the fluxes between them
+clustering_sequence = []
+for tidx, clustering in enumerate(cluster_sizes):
+    clusters = Cluster.from_arrays(
+        heights=list(clustering.values()),
+        labels=["{0}".format(cid) for cid in clustering],
+        facecolor=[cluster_color[cid] for cid in clustering],
+        )
+    if tidx:
+        for (from_csid, to_csid), flux in between_fluxes[tidx - 1].items():
+            Flux(
+                flux=flux,
+                source_cluster=clustering_sequence[-1][from_csid],
+                target_cluster=clusters[to_csid],
+                facecolor='source_cluster'
+                )
+    clustering_sequence.append(clusters)
 
 # #############################################################################
 # Create the figure
@@ -63,12 +62,14 @@ if True:
     ax_sk.axis('equal')
     ax_sk.set_xlim(0, 25)
     ax_sk.set_ylim(-0.6, 3)
-    AlluvialPlot(clustering_sequence, ax_sk, **alluvial_plot_params)
+    AlluvialPlot(
+        dict(zip(time_points, clustering_sequence)), ax_sk,
+        **alluvial_plot_params)
     ax_sk.set_xticks(time_points, minor=False)
     ax_sk.set_xticklabels(
         [
             r'$\mathbf{{t_{0}}}$'.format(idx)
-            for idx in range(6)
+            for idx in range(len(time_points))
             ],
         minor=False,
         size=9
@@ -93,58 +94,44 @@ if True:
             'size': 8,
 
             }
+
+    def _clone(kwargs, **arrowprops):
+        # only 'arrowprops' gets altered per annotation, copy just that level
+        _kwargs = dict(kwargs)
+        _kwargs['arrowprops'] = dict(kwargs['arrowprops'], **arrowprops)
+        return _kwargs
+
+    def _bracket(width, angle, relpos):
+        return {
+                'arrowstyle': '-[,widthB={0},lengthB=0.2'.format(width),
+                'connectionstyle': 'angle3,angleA=-90,angleB={0}'.format(
+                    angle
+                    ),
+                'relpos': relpos
+                }
+
     u_y, l_y = 0.8, 0.76
-    # birth
-    label = 'birth'
-    xytext = (0.12, u_y)
-    sk_kw = deepcopy(sk_kwargs)
-    sk_kw['arrowprops']['arrowstyle'] = '-[,widthB=3.1,lengthB=0.2'
-    angle = 62
-    xkcd_angle = 25.5
-    sk_kw['arrowprops'][
-        'connectionstyle'] = 'angle3,angleA=-90,angleB={0}'.format(angle)
-    sk_kw['arrowprops']['relpos'] = (0.4, 0.0)
-    ax_sk.annotate(label, xy=(-0.6, 0.01), xytext=xytext, **sk_kw)
-    # growth
-    label = 'growth'
-    xytext = (0.29, l_y)
-    sgp_kw = deepcopy(sk_kwargs)
-    sgp_kw['arrowprops']['arrowstyle'] = '-[,widthB=2.1,lengthB=0.2'
-    angle = 39.2
-    xkcd_angle = 25.5
-    sgp_kw['arrowprops'][
-        'connectionstyle'] = 'angle3,angleA=-90,angleB={0}'.format(angle)
-    sgp_kw['arrowprops']['relpos'] = (0.4, 0.0)
-    ax_sk.annotate(label, xy=(3.4, 1.5), xytext=xytext, **sgp_kw)
-    # split
-    label = 'split'
-    xytext = (0.43, u_y)
-    ax_sk.annotate(label, xy=(7.0, 2.8), xytext=xytext, **sk_kwargs)
-    # merge
-    label = 'merge'
-    xytext = (0.60, l_y)
-    ax_sk.annotate(label, xy=(12.0, 2.8), xytext=xytext, **sk_kwargs)
-    # shrink
-    label = 'shrinkage'
-    xytext = (0.83, u_y)
-    sgp_kw = deepcopy(sk_kwargs)
-    sgp_kw['arrowprops']['arrowstyle'] = '-[,widthB=1.0,lengthB=0.2'
-    sgp_kw['arrowprops']['connectionstyle'] = 'angle3,angleA=-90,angleB=-3.0'
-    sgp_kw['arrowprops']['relpos'] = (0.8, 0.0)
-    ax_sk.annotate(label, xy=(14.5, 2.0), xytext=xytext, **sgp_kw)
-    # death
-    label = 'death'
-    xytext = (0.97, l_y)
-    sk_kw = deepcopy(sk_kwargs)
-    sk_kw['arrowprops']['arrowstyle'] = '-[,widthB=4.2,lengthB=0.2'
-    angle = 174.0
-    xkcd_angle = 165.5
-    sk_kw['arrowprops'][
-        'connectionstyle'] = 'angle3,angleA=-90,angleB={0}'.format(angle)
-    sk_kw['arrowprops']['relpos'] = (0.85, 0.0)
-    ax_sk.annotate(label, xy=(18.7, 0.0), xytext=xytext, **sk_kw)
+    # (label, xy, xytext, arrowprops overwriting the defaults)
+    annotations = (
+            # xkcd: angleB=25.5
+            ('birth', (-0.6, 0.01), (0.12, u_y),
+                _bracket(3.1, 62, (0.4, 0.0))),
+            # xkcd: angleB=25.5
+            ('growth', (3.4, 1.5), (0.29, l_y),
+                _bracket(2.1, 39.2, (0.4, 0.0))),
+            ('split', (7.0, 2.8), (0.43, u_y), None),
+            ('merge', (12.0, 2.8), (0.60, l_y), None),
+            ('shrinkage', (14.5, 2.0), (0.83, u_y),
+                _bracket(1.0, -3.0, (0.8, 0.0))),
+            # xkcd: angleB=165.5
+            ('death', (18.7, 0.0), (0.97, l_y),
+                _bracket(4.2, 174.0, (0.85, 0.0))),
+            )
+    for label, xy, xytext, arrowprops in annotations:
+        sk_kw = _clone(sk_kwargs, **arrowprops) if arrowprops else sk_kwargs
+        ax_sk.annotate(label, xy=xy, xytext=xytext, **sk_kw)
     # ########################################3
     # save the figure
-    fig1.savefig('life_cycles.pdf')
+    fig1.savefig('life_cycles.pdf', dpi=300)
     fig1.savefig('life_cycles.png')
     # fig1.savefig('life_cycles.svg')
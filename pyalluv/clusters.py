@@ -1,9 +1,46 @@
 # -*- coding: utf-8 -*-
 
 
+import numpy as np
 from matplotlib.path import Path
 import matplotlib.patches as patches
 
+# locations of fluxes at a cluster, used to index the anchors and margins
+BOTTOM = 0
+TOP = 1
+# codes of the closed rectangle outlining a cluster
+_RECT_CODES = np.array(
+        [Path.MOVETO, Path.LINETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY],
+        dtype=Path.code_type
+        )
+
+
+def _out_flux_key(out_flux):
+    r"""
+    Sort key placing out-fluxes at the top first, by decreasing position of
+    their target cluster, followed by the out-fluxes at the bottom, by
+    increasing position. Missing target clusters count as at -10000.
+    """
+    target_cluster = out_flux.target_cluster
+    mid_height = target_cluster.mid_height \
+        if target_cluster is not None else -10000
+    if out_flux.out_loc == TOP:
+        return (0, -mid_height)
+    return (1, mid_height)
+
+
+def _in_flux_key(in_flux):
+    r"""
+    Same as :func:`_out_flux_key` but for in-fluxes and their source
+    clusters.
+    """
+    source_cluster = in_flux.source_cluster
+    mid_height = source_cluster.mid_height \
+        if source_cluster is not None else -10000
+    if in_flux.in_loc == TOP:
+        return (0, -mid_height)
+    return (1, mid_height)
+
 
 class Cluster(object):
     r"""
@@ -43,6 +80,8 @@ class Cluster(object):
       Horizontal position of the cluster anchor.
     y_pos: float
       Vertical position of the cluster center.
+    y_top: float
+      Vertical position of the upper edge of the cluster.
     x_anchor: str
       Anchor position relative to the rectangle representing the cluster.
       Possible values are: ``'center'``, ``'left'`` or ``'right'``.
@@ -58,6 +97,15 @@ class Cluster(object):
       All outgoing fluxes of this cluster.
 
     """
+    __slots__ = (
+            '_interp_steps', 'x_anchor', 'label', 'label_margin', '_closed',
+            '_readonly', 'patch_kwargs', 'height', 'width', 'x_pos', 'y_pos',
+            'mid_height', 'y_top', 'out_fluxes', 'in_fluxes', 'in_margin',
+            'out_margin', '_in', '_out', '_anchors_outdated', 'in_weights',
+            'in_sources', 'out_weights', 'out_targets',
+            '_flux_anchors_outdated'
+            )
+
     def __init__(self, height, anchor=None, width=1.0, label=None, **kwargs):
         self._interp_steps = kwargs.pop('_interpolation_steps', 1)
         self.x_anchor = kwargs.pop('x_anchor', 'center')
@@ -78,22 +126,122 @@ class Cluster(object):
             x_coord, y_coord = anchor
         else:
             x_coord, y_coord = anchor, None
+        # ref points to add fluxes, set lazily, see set_in_out_anchors
+        self._in = None
+        self._out = None
+        self._anchors_outdated = False
+        # whether the fluxes need to be anchored again, as the cluster or its
+        # fluxes changed, see AlluvialPlot.get_patchcollection
+        self._flux_anchors_outdated = True
         self = self.set_x_pos(x_coord).set_y_pos(y_coord)
 
         # init the in and out fluxes:
         self.out_fluxes = []
         self.in_fluxes = []
-        self.in_margin = {
-                'bottom': 0,
-                'top': 0
+        # margins at the bottom and the top, see BOTTOM and TOP
+        self.in_margin = [0, 0]
+        self.out_margin = [0, 0]
+        # widths of the fluxes from/to other clusters, see set_flux_weights
+        self.in_weights = None
+        self.in_sources = None
+        self.out_weights = None
+        self.out_targets = None
+
+    @classmethod
+    def from_arrays(cls, heights, labels=None, width=1.0, **kwargs):
+        r"""
+        Create a list of clusters from a sequence of heights.
+
+        Parameters
+        -----------
+        heights: array_like
+          The sizes of the clusters to create.
+        labels: list[str] (default=None)
+          Labels for the clusters, if provided it must be of the same length as
+          `heights`.
+        width: float (default=1.0)
+          Set the width of all clusters.
+        \**kwargs optional parameter:
+          Passed on to each :class:`.Cluster`. A `list` holds one value per
+          cluster and must be of the same length as `heights`, any other
+          value, e.g. a color given as `tuple`, is used for all clusters.
+
+        Returns
+        --------
+        clusters: list[:class:`.Cluster`]
+          One cluster per element in `heights`.
+
+        """
+        heights = np.asarray(heights).tolist()
+        if not isinstance(heights, list):
+            raise ValueError(
+                    "'heights' must be a sequence, not {!r}".format(heights)
+                    )
+        if labels is None:
+            labels = [None] * len(heights)
+        elif len(labels) != len(heights):
+            raise ValueError(
+                    "'labels' holds {} values for {} clusters".format(
+                        len(labels), len(heights)
+                        )
+                    )
+        per_cluster = {
+                kw: kwargs.pop(kw) for kw in list(kwargs)
+                if isinstance(kwargs[kw], list)
                 }
-        self.out_margin = {
-                'bottom': 0,
-                'top': 0}
+        for kw, values in per_cluster.items():
+            if len(values) != len(heights):
+                raise ValueError(
+                        "'{}' holds {} values for {} clusters, provide a "
+                        "tuple to use the same value for all clusters".format(
+                            kw, len(values), len(heights)
+                            )
+                        )
+        clusters = []
+        for i, height in enumerate(heights):
+            _kwargs = dict(kwargs)
+            for kw, values in per_cluster.items():
+                _kwargs[kw] = values[i]
+            clusters.append(
+                    cls(height, width=width, label=labels[i], **_kwargs)
+                    )
+        return clusters
+
+    def set_flux_weights(self,):
+        r"""
+        Gather the fluxes connecting this cluster to other clusters.
 
-        # ref points to add fluxes
-        self.in_ = None
-        self.out_ = None
+        This sets :attr:`in_weights` and :attr:`out_weights`, tuples holding
+        the widths of all in- and out-fluxes with a source or target cluster,
+        and :attr:`in_sources` and :attr:`out_targets` holding the
+        corresponding source and target clusters.
+
+        Returns
+        --------
+        self: :class:`.Cluster`
+          with updated flux weights.
+
+        """
+        in_fluxes = [
+                in_flux for in_flux in self.in_fluxes
+                if in_flux.source_cluster is not None
+                ]
+        self.in_weights = tuple(in_flux.flux_width for in_flux in in_fluxes)
+        self.in_sources = tuple(
+                in_flux.source_cluster for in_flux in in_fluxes
+                )
+        out_fluxes = [
+                out_flux for out_flux in self.out_fluxes
+                if out_flux.target_cluster is not None
+                ]
+        self.out_weights = tuple(
+                out_flux.flux_width for out_flux in out_fluxes
+                )
+        self.out_targets = tuple(
+                out_flux.target_cluster for out_flux in out_fluxes
+                )
+
+        return self
 
     def set_x_pos(self, x_pos):
         r"""
@@ -114,6 +262,8 @@ class Cluster(object):
 
         """
         self.x_pos = x_pos
+        self._anchors_outdated = True
+        self._flux_anchors_outdated = True
         if self.x_pos is not None:
             self.x_pos -= 0.5 * self.width
             if self.x_anchor == 'left':
@@ -124,136 +274,121 @@ class Cluster(object):
         return self
 
     def get_patch(self, **kwargs):
+        r"""
+        Create the patch representing this cluster.
+
+        Parameters
+        -----------
+        \**kwargs optional parameter:
+          Styling for the patch, see :meth:`~.Cluster.get_patch_kwargs`.
+
+        Returns
+        --------
+        patch: :class:`~matplotlib.patches.PathPatch`
+          The styled rectangle of this cluster.
+
+        """
+        return patches.PathPatch(
+                self.get_path(),
+                **self.get_patch_kwargs(**kwargs)
+                )
+
+    def get_patch_kwargs(self, **kwargs):
+        r"""
+        Resolve the styling of this cluster.
+
+        Parameters
+        -----------
+        \**kwargs optional parameter:
+          Styling for the cluster, the cluster specific styling provided at
+          creation takes precedence.
+
+        Returns
+        --------
+        patch_kwargs: dict
+          Keyword arguments for a :class:`~matplotlib.patches.PathPatch`.
+
+        """
         _kwargs = dict(kwargs)
         _kwargs.update(self.patch_kwargs)
-        self.set_in_out_anchors()
+        return _kwargs
+
+    def get_path(self):
+        r"""
+        Create the rectangular path outlining this cluster.
+
+        Returns
+        --------
+        path: :class:`~matplotlib.path.Path`
+          Closed rectangle at the position of the cluster.
+
+        """
+        return Path(
+                self.get_vertices(),
+                _RECT_CODES,
+                self._interp_steps,
+                self._closed,
+                self._readonly
+                )
+
+    def get_vertices(self):
+        r"""
+        Return the vertices of the rectangle outlining this cluster.
 
-        vertices = [
+        Returns
+        --------
+        vertices: list
+          The 5 vertices of the rectangle, starting and ending at the bottom
+          left corner. They go along with the codes of :meth:`get_path`.
+
+        """
+        return [
                 (self.x_pos, self.y_pos),
-                (self.x_pos, self.y_pos + self.height),
-                (self.x_pos + self.width, self.y_pos + self.height),
+                (self.x_pos, self.y_top),
+                (self.x_pos + self.width, self.y_top),
                 (self.x_pos + self.width, self.y_pos),
                 # this is just ignored as the code is CLOSEPOLY
                 (self.x_pos, self.y_pos)
                 ]
-        codes = [
-                Path.MOVETO,
-                Path.LINETO,
-                Path.LINETO,
-                Path.LINETO,
-                Path.CLOSEPOLY
-                ]
-
-        return patches.PathPatch(
-                Path(
-                    vertices,
-                    codes,
-                    self._interp_steps,
-                    self._closed,
-                    self._readonly
-                    ),
-                **_kwargs
-                )
 
     def set_loc_out_fluxes(self,):
+        mid_height = self.mid_height
         for out_flux in self.out_fluxes:
-            in_loc = None
-            out_loc = None
-            if out_flux.target_cluster is not None:
-                if self.mid_height > out_flux.target_cluster.mid_height:
-                    # draw to top
-                    if self.mid_height >= \
-                            out_flux.target_cluster.in_['top'][1]:
-                        # draw from bottom to in top
-                        out_loc = 'bottom'
-                        in_loc = 'top'
-                    else:
-                        # draw from top to top
-                        out_loc = 'top'
-                        in_loc = 'top'
-                else:
-                    # draw to bottom
-                    if self.mid_height <= \
-                            out_flux.target_cluster.in_['bottom'][1]:
-                        # draw from top to bottom
-                        out_loc = 'top'
-                        in_loc = 'bottom'
-                    else:
-                        # draw form bottom to bottom
-                        out_loc = 'bottom'
-                        in_loc = 'bottom'
+            target_cluster = out_flux.target_cluster
+            if target_cluster is None:
+                out_flux.in_loc = None
+                out_flux.out_loc = None
+            elif mid_height > target_cluster.mid_height:
+                # draw to top: from bottom if above the target, else from top
+                out_flux.in_loc = TOP
+                out_flux.out_loc = BOTTOM \
+                    if mid_height >= target_cluster.y_top else TOP
             else:
-                out_flux.out_loc = out_flux.out_flux_vanish
-            out_flux.in_loc = in_loc
-            out_flux.out_loc = out_loc
+                # draw to bottom: from top if below the target, else from
+                # bottom
+                out_flux.in_loc = BOTTOM
+                out_flux.out_loc = TOP \
+                    if mid_height <= target_cluster.y_pos else BOTTOM
 
     def sort_out_fluxes(self,):
-        _top_fluxes = [
-                (i, self.out_fluxes[i])
-                for i in range(len(self.out_fluxes))
-                if self.out_fluxes[i].out_loc == 'top'
-                ]
-        _bottom_fluxes = [
-                (i, self.out_fluxes[i])
-                for i in range(len(self.out_fluxes))
-                if self.out_fluxes[i].out_loc == 'bottom'
-                ]
-        if _top_fluxes:
-            sorted_top_idx, _fluxes_top = zip(*sorted(
-                _top_fluxes,
-                key=lambda x: x[1].target_cluster.mid_height
-                if x[1].target_cluster
-                else -10000,
-                reverse=True
-                ))
-        else:
-            sorted_top_idx = []
-        if _bottom_fluxes:
-            sorted_bottom_idx, _fluxes_bottom = zip(*sorted(
-                _bottom_fluxes,
-                key=lambda x: x[1].target_cluster.mid_height
-                if x[1].target_cluster
-                else -10000,
-                reverse=False
-                ))
-        else:
-            sorted_bottom_idx = []
-        sorted_idx = list(sorted_top_idx) + list(sorted_bottom_idx)
-        self.out_fluxes = [self.out_fluxes[i] for i in sorted_idx]
+        # fluxes neither at the top nor the bottom are dropped
+        self.out_fluxes = sorted(
+                [
+                    out_flux for out_flux in self.out_fluxes
+                    if out_flux.out_loc in (BOTTOM, TOP)
+                    ],
+                key=_out_flux_key
+                )
 
     def sort_in_fluxes(self,):
-        _top_fluxes = [
-                (i, self.in_fluxes[i])
-                for i in range(len(self.in_fluxes))
-                if self.in_fluxes[i].in_loc == 'top'
-                ]
-        _bottom_fluxes = [
-                (i, self.in_fluxes[i])
-                for i in range(len(self.in_fluxes))
-                if self.in_fluxes[i].in_loc == 'bottom'
-                ]
-        if _top_fluxes:
-            sorted_top_idx, _fluxes_top = zip(*sorted(
-                _top_fluxes,
-                key=lambda x: x[1].source_cluster.mid_height
-                if x[1].source_cluster
-                else -10000,
-                reverse=True
-                ))
-        else:
-            sorted_top_idx = []
-        if _bottom_fluxes:
-            sorted_bottom_idx, _fluxes_bottom = zip(*sorted(
-                _bottom_fluxes,
-                key=lambda x: x[1].source_cluster.mid_height
-                if x[1].source_cluster
-                else -10000,
-                reverse=False
-                ))
-        else:
-            sorted_bottom_idx = []
-        sorted_idx = list(sorted_top_idx) + list(sorted_bottom_idx)
-        self.in_fluxes = [self.in_fluxes[i] for i in sorted_idx]
+        # fluxes neither at the top nor the bottom are dropped
+        self.in_fluxes = sorted(
+                [
+                    in_flux for in_flux in self.in_fluxes
+                    if in_flux.in_loc in (BOTTOM, TOP)
+                    ],
+                key=_in_flux_key
+                )
 
     def get_loc_out_flux(self, flux_width, out_loc, in_loc):
         anchor_out = (
@@ -261,33 +396,60 @@ class Cluster(object):
                 out_loc][0],
             self.out_[out_loc][1] +
             self.out_margin[out_loc] +
-            (flux_width if in_loc == 'bottom' else 0)
+            (flux_width if in_loc == BOTTOM else 0)
             )
         top_out = (
             self.out_[
                 out_loc][0],
             self.out_[out_loc][1] +
             self.out_margin[out_loc] +
-            (flux_width if in_loc == 'top' else 0)
+            (flux_width if in_loc == TOP else 0)
             )
         self.out_margin[out_loc] += flux_width
         return anchor_out, top_out
 
     def set_anchor_out_fluxes(self,):
+        r"""
+        Set the anchor points of all out-fluxes.
+
+        This does for all out-fluxes at once what :meth:`get_loc_out_flux`
+        does for a single one: each flux starts where the previous one at the
+        same location ended, fluxes at the top growing downwards.
+        """
+        margins = self.out_margin = [0, 0]
         for out_flux in self.out_fluxes:
+            out_loc = out_flux.out_loc
+            x, y = self.out_[out_loc]
+            y += margins[out_loc]
             out_width = out_flux.flux_width \
-                    if out_flux.out_loc == 'bottom' else - out_flux.flux_width
-            out_flux.anchor_out, out_flux.top_out = self.get_loc_out_flux(
-                    out_width, out_flux.out_loc, out_flux.in_loc
+                if out_loc == BOTTOM else - out_flux.flux_width
+            in_loc = out_flux.in_loc
+            out_flux.anchor_out = (
+                    x, y + (out_width if in_loc == BOTTOM else 0)
                     )
+            out_flux.top_out = (x, y + (out_width if in_loc == TOP else 0))
+            margins[out_loc] += out_width
 
     def set_anchor_in_fluxes(self,):
+        r"""
+        Set the anchor points of all in-fluxes.
+
+        Same as :meth:`set_anchor_out_fluxes` but for the in-fluxes, see also
+        :meth:`get_loc_in_flux`.
+        """
+        margins = self.in_margin = [0, 0]
         for in_flux in self.in_fluxes:
+            in_loc = in_flux.in_loc
+            x, y = self.in_[in_loc]
+            y += margins[in_loc]
             in_width = in_flux.flux_width \
-                    if in_flux.in_loc == 'bottom' else - in_flux.flux_width
-            in_flux.anchor_in, in_flux.top_in = self.get_loc_in_flux(
-                    in_width, in_flux.out_loc, in_flux.in_loc
+                if in_loc == BOTTOM else - in_flux.flux_width
+            out_loc = in_flux.out_loc
+            in_flux.anchor_in = (
+                    x, y + (in_width if out_loc == BOTTOM else 0)
                     )
+            in_flux.top_in = (x, y + (in_width if out_loc == TOP else 0))
+            margins[in_loc] += in_width
 
     def get_loc_in_flux(self, flux_width, out_loc, in_loc):
         anchor_in = (
@@ -295,49 +457,81 @@ class Cluster(object):
                 in_loc][0],
             self.in_[in_loc][1] +
             self.in_margin[in_loc] +
-            (flux_width if out_loc == 'bottom' else 0)
+            (flux_width if out_loc == BOTTOM else 0)
             )
         top_in = (
             self.in_[
                 in_loc][0],
             self.in_[in_loc][1] +
             self.in_margin[in_loc] +
-            (flux_width if out_loc == 'top' else 0)
+            (flux_width if out_loc == TOP else 0)
             )
         self.in_margin[in_loc] += flux_width
         return anchor_in, top_in
 
     def set_mid_height(self, mid_height):
         self.mid_height = mid_height
+        self._flux_anchors_outdated = True
         if self.mid_height is not None:
             self.y_pos = self.mid_height - 0.5 * self.height
-            self.set_in_out_anchors()
+            self.y_top = self.y_pos + self.height
+            self._anchors_outdated = True
         else:
             self.y_pos = None
+            self.y_top = None
 
     def set_y_pos(self, y_pos):
         self.y_pos = y_pos
+        self._flux_anchors_outdated = True
         if self.y_pos is not None:
             self.mid_height = self.y_pos + 0.5 * self.height
-            self.set_in_out_anchors()
+            self.y_top = self.y_pos + self.height
+            self._anchors_outdated = True
         else:
             self.mid_height = None
+            self.y_top = None
 
         return self
 
     def set_in_out_anchors(self,):
         """
         This sets the proper anchor points for fluxes to enter/leave
+
+        :attr:`in_` and :attr:`out_` hold the bottom and the top anchor, in
+        this order, such that they can be indexed with :data:`BOTTOM` and
+        :data:`TOP`.
         """
         # if self.y_pos is None or self.mid_height is None:
         #     self.set_y_pos()
 
-        self.in_ = {
-                'bottom': (self.x_pos, self.y_pos),  # left, bottom
-                'top': (self.x_pos, self.y_pos + self.height)  # left, top
-                }
-        self.out_ = {
-                # right, top
-                'top': (self.x_pos + self.width, self.y_pos + self.height),
-                'bottom': (self.x_pos + self.width, self.y_pos)  # right,bottom
-        }
+        self._in = (
+                (self.x_pos, self.y_pos),  # left, bottom
+                (self.x_pos, self.y_top)  # left, top
+                )
+        self._out = (
+                (self.x_pos + self.width, self.y_pos),  # right, bottom
+                (self.x_pos + self.width, self.y_top)  # right, top
+                )
+        self._anchors_outdated = False
+
+    @property
+    def in_(self):
+        r"""
+        The bottom and top anchor points for in-fluxes.
+
+        They are only recomputed when accessed after the cluster has moved.
+        """
+        if self._anchors_outdated:
+            self.set_in_out_anchors()
+        return self._in
+
+    @property
+    def out_(self):
+        r"""
+        The bottom and top anchor points for out-fluxes.
+
+        They are only recomputed when accessed after the cluster has moved.
+        """
+        if self._anchors_outdated:
+            self.set_in_out_anchors()
+        return self._out
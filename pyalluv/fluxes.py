@@ -1,9 +1,38 @@
 # -*- coding: utf-8 -*-
 
 
+import numpy as np
 from matplotlib.path import Path
 import matplotlib.patches as patches
 
+from .clusters import BOTTOM
+
+# codes of the closed path outlining a flux, see Flux.get_path
+_FLUX_CODES = np.array(
+        [
+            Path.MOVETO,
+            Path.CURVE4, Path.CURVE4, Path.CURVE4,
+            Path.LINETO, Path.LINETO, Path.LINETO,
+            Path.CURVE4, Path.CURVE4, Path.CURVE4,
+            Path.LINETO, Path.LINETO,
+            Path.CLOSEPOLY
+            ],
+        dtype=Path.code_type
+        )
+
+# color directives taking the color of a cluster, see Flux.get_patch_kwargs
+# maps to (color of the target cluster, flow type)
+_COLOR_DIRECTIVES = {
+        'cluster': (False, None),
+        'source_cluster': (False, None),
+        'target_cluster': (True, None),
+        }
+for _cluster in ('cluster', 'source_cluster', 'target_cluster'):
+    for _flow_type in ('migration', 'reside'):
+        _COLOR_DIRECTIVES['{0}__{1}'.format(_cluster, _flow_type)] = (
+                _cluster == 'target_cluster', _flow_type
+                )
+
 
 class Flux(object):
     r"""
@@ -48,6 +77,14 @@ class Flux(object):
     target_cluster: :class:`pyalluv.clusters.Cluster` (default=None)
       Cluster into which the flux leads.
     """
+    __slots__ = (
+            '_interp_steps', 'out_flux_vanish', 'default_fc', 'default_ec',
+            'default_alpha', 'closed', 'readonly', 'patch_kwargs', 'flux',
+            'relative_flux', 'source_cluster', 'target_cluster', 'flux_width',
+            'in_loc', 'out_loc', 'anchor_in', 'top_in', 'anchor_out',
+            'top_out', '_in_kwargs', '_out_kwargs'
+            )
+
     def __init__(
             self, flux,
             source_cluster=None, target_cluster=None,
@@ -64,6 +101,15 @@ class Flux(object):
         #         )
         self.closed = kwargs.pop('closed', False)
         self.readonly = kwargs.pop('readonly', False)
+        # in/out only styling, applied in get_patch_kwargs
+        self._in_kwargs = {
+                kw[3:]: kwargs.pop(kw) for kw in list(kwargs)
+                if kw.startswith('in_')
+                }
+        self._out_kwargs = {
+                kw[4:]: kwargs.pop(kw) for kw in list(kwargs)
+                if kw.startswith('out_')
+                }
         self.patch_kwargs = kwargs
         self.patch_kwargs['lw'] = self.patch_kwargs.pop(
                 'linewidth', self.patch_kwargs.pop('lw', 0.0)
@@ -76,32 +122,207 @@ class Flux(object):
         self.relative_flux = relative_flux
         self.source_cluster = source_cluster
         self.target_cluster = target_cluster
-        if self.source_cluster is not None:
-            if self.relative_flux:
-                self.flux_width = self.flux * self.source_cluster.height
-            else:
-                self.flux_width = self.flux
-        else:
-            if self.target_cluster is not None:
-                if self.relative_flux:
-                    self.flux_width = self.flux * self.target_cluster.height
-                else:
-                    self.flux_width = self.flux
+        if not self.relative_flux:
+            self.flux_width = self.flux
+        elif self.source_cluster is not None:
+            self.flux_width = self.flux * self.source_cluster.height
+        elif self.target_cluster is not None:
+            self.flux_width = self.flux * self.target_cluster.height
         # append the flux to the clusters
         if self.source_cluster is not None:
             self.source_cluster.out_fluxes.append(self)
+            self.source_cluster._flux_anchors_outdated = True
         if self.target_cluster is not None:
             self.target_cluster.in_fluxes.append(self)
+            self.target_cluster._flux_anchors_outdated = True
+
+    @classmethod
+    def from_arrays(
+            cls, fluxes, source_clusters=None, target_clusters=None,
+            **kwargs):
+        r"""
+        Create a list of fluxes from a sequence of flux sizes.
+
+        Parameters
+        -----------
+        fluxes: array_like
+          The sizes of the fluxes to create.
+        source_clusters: list[:class:`pyalluv.clusters.Cluster`] (default=None)
+          Clusters from which the fluxes originate, one per flux.
+        target_clusters: list[:class:`pyalluv.clusters.Cluster`] (default=None)
+          Clusters into which the fluxes lead, one per flux.
+        \**kwargs optional parameter:
+          Passed on to each :class:`.Flux`. A `list` holds one value per flux
+          and must be of the same length as `fluxes`, any other value, e.g. a
+          color given as `tuple`, is used for all fluxes.
+
+        Returns
+        --------
+        fluxes: list[:class:`.Flux`]
+          One flux per element in `fluxes`.
+
+        """
+        fluxes = np.asarray(fluxes).tolist()
+        if not isinstance(fluxes, list):
+            raise ValueError(
+                    "'fluxes' must be a sequence, not {!r}".format(fluxes)
+                    )
+        if source_clusters is None:
+            source_clusters = [None] * len(fluxes)
+        if target_clusters is None:
+            target_clusters = [None] * len(fluxes)
+        for kw, clusters in (
+                ('source_clusters', source_clusters),
+                ('target_clusters', target_clusters)):
+            if len(clusters) != len(fluxes):
+                raise ValueError(
+                        "'{}' holds {} clusters for {} fluxes".format(
+                            kw, len(clusters), len(fluxes)
+                            )
+                        )
+        per_flux = {
+                kw: kwargs.pop(kw) for kw in list(kwargs)
+                if isinstance(kwargs[kw], list)
+                }
+        for kw, values in per_flux.items():
+            if len(values) != len(fluxes):
+                raise ValueError(
+                        "'{}' holds {} values for {} fluxes, provide a "
+                        "tuple to use the same value for all fluxes".format(
+                            kw, len(values), len(fluxes)
+                            )
+                        )
+        _fluxes = []
+        for i, flux in enumerate(fluxes):
+            _kwargs = dict(kwargs)
+            for kw, values in per_flux.items():
+                _kwargs[kw] = values[i]
+            _fluxes.append(
+                    cls(
+                        flux,
+                        source_cluster=source_clusters[i],
+                        target_cluster=target_clusters[i],
+                        **_kwargs
+                        )
+                    )
+        return _fluxes
+
+    @staticmethod
+    def get_paths(fluxes):
+        r"""
+        Create the paths outlining several fluxes at once.
+
+        This gives the same paths as calling :meth:`get_path` for each flux,
+        but the vertices of all fluxes are computed together.
+
+        Parameters
+        -----------
+        fluxes: list[:class:`.Flux`]
+          Fluxes with both a source and a target cluster and all their anchor
+          points set.
+
+        Returns
+        --------
+        paths: list[:class:`~matplotlib.path.Path`]
+          One closed path per flux.
+
+        """
+        if not fluxes:
+            return []
+        _anchors = np.array(
+                [
+                    flux.anchor_out + flux.top_out +
+                    flux.anchor_in + flux.top_in + (
+                        flux.target_cluster.in_[BOTTOM][0] -
+                        flux.source_cluster.out_[BOTTOM][0],
+                        flux.source_cluster.width,
+                        flux.target_cluster.width
+                        )
+                    for flux in fluxes
+                    ],
+                dtype=float
+                )
+        anchor_out = _anchors[:, 0:2]
+        top_out = _anchors[:, 2:4]
+        anchor_in = _anchors[:, 4:6]
+        top_in = _anchors[:, 6:8]
+        _dist = 2/3 * _anchors[:, 8]
+        _out_inner = 0.5 * _anchors[:, 9]
+        _in_inner = 0.5 * _anchors[:, 10]
+        # same vertex order as in get_path
+        vertices = np.empty((len(fluxes), 13, 2))
+        vertices[:, [0, 12]] = anchor_out[:, None]
+        vertices[:, 3] = anchor_in
+        vertices[:, 6] = top_in
+        vertices[:, 9] = top_out
+        vertices[:, [1, 11, 2, 4, 5, 7, 8, 10], 1] = _anchors[
+                :, [1, 1, 5, 5, 7, 7, 3, 3]
+                ]
+        vertices[:, 1, 0] = anchor_out[:, 0] + _dist
+        vertices[:, 11, 0] = anchor_out[:, 0] - _out_inner
+        vertices[:, 2, 0] = anchor_in[:, 0] - _dist
+        vertices[:, 4, 0] = anchor_in[:, 0] + _in_inner
+        vertices[:, 5, 0] = top_in[:, 0] + _in_inner
+        vertices[:, 7, 0] = top_in[:, 0] - _dist
+        vertices[:, 8, 0] = top_out[:, 0] + _dist
+        vertices[:, 10, 0] = top_out[:, 0] - _out_inner
+        return [
+                Path(
+                    _vertices, _FLUX_CODES, flux._interp_steps, flux.closed,
+                    flux.readonly
+                    )
+                for flux, _vertices in zip(fluxes, vertices)
+                ]
 
     def get_patch(self, **kwargs):
-        _kwargs = dict(kwargs)
-        _to_in_kwargs = {}
-        _to_out_kwargs = {}
-        for kw in _kwargs:
-            if kw.startswith('in_'):
-                _to_in_kwargs[kw[3:]] = _kwargs.pop(kw)
-            elif kw.startswith('out_'):
-                _to_out_kwargs[kw[3:]] = _kwargs.pop(kw)
+        r"""
+        Create the patch representing this flux.
+
+        Parameters
+        -----------
+        \**kwargs optional parameter:
+          Styling for the patch, see :meth:`~.Flux.get_patch_kwargs`.
+
+        Returns
+        --------
+        patch: :class:`~matplotlib.patches.PathPatch`
+          The styled path of this flux.
+
+        """
+        return patches.PathPatch(
+                self.get_path(), **self.get_patch_kwargs(**kwargs)
+                )
+
+    def get_patch_kwargs(self, **kwargs):
+        r"""
+        Resolve the styling of this flux.
+
+        Parameters
+        -----------
+        \**kwargs optional parameter:
+          Styling for the flux, the flux specific styling takes precedence.
+          Keys prefixed with ``'in_'`` or ``'out_'`` only apply to fluxes
+          without source or without target cluster, respectively. This holds
+          also for the styling passed on creation of the flux.
+
+        Returns
+        --------
+        patch_kwargs: dict
+          Keyword arguments for a :class:`~matplotlib.patches.PathPatch`.
+
+        """
+        _to_in_kwargs = {
+                kw[3:]: value for kw, value in kwargs.items()
+                if kw.startswith('in_')
+                }
+        _to_out_kwargs = {
+                kw[4:]: value for kw, value in kwargs.items()
+                if kw.startswith('out_')
+                }
+        _kwargs = {
+                kw: value for kw, value in kwargs.items()
+                if not kw.startswith(('in_', 'out_'))
+                }
         # update with Flux specific styling
         _kwargs.update(self.patch_kwargs)
         for _color in ['facecolor', 'edgecolor']:
@@ -111,42 +332,38 @@ class Flux(object):
                 _kwargs['alpha'] = _set_alpha
                 _set_alpha = None
             color_is_set = False
-            if _set_color == 'source_cluster' or _set_color == 'cluster':
-                from_cluster = self.source_cluster
-                color_is_set = True
-            elif _set_color == 'target_cluster':
-                from_cluster = self.target_cluster
-                color_is_set = True
-            elif isinstance(_set_color, str) and '__' in _set_color:
-                which_cluster, flow_type = _set_color.split('__')
-                if which_cluster == 'target_cluster':
+            if isinstance(_set_color, str):
+                directive = _COLOR_DIRECTIVES.get(_set_color)
+                if directive is None and '__' in _set_color:
+                    which_cluster, flow_type = _set_color.split('__')
+                    directive = (which_cluster == 'target_cluster', flow_type)
+            else:
+                directive = None
+            if directive is not None:
+                from_target, flow_type = directive
+                if from_target:
                     from_cluster = self.target_cluster
                 else:
                     from_cluster = self.source_cluster
-                if flow_type == 'migration' \
+                if flow_type is None:
+                    color_is_set = True
+                elif flow_type == 'migration' \
                         and self.source_cluster.patch_kwargs.get(_color) \
                         != self.target_cluster.patch_kwargs.get(_color):
                     color_is_set = True
-                    if _set_alpha:
-                        _kwargs['alpha'] = _set_alpha.get(
-                                'migration', _set_alpha.get(
-                                    'default',
-                                    self.default_alpha
-                                    )
-                                )
                 elif flow_type == 'reside'  \
                         and self.source_cluster.patch_kwargs.get(_color) \
                         == self.target_cluster.patch_kwargs.get(_color):
                     color_is_set = True
-                    if _set_alpha:
-                        _kwargs['alpha'] = _set_alpha.get(
-                                'reside', _set_alpha.get(
-                                    'default',
-                                    self.default_alpha
-                                    )
-                                )
                 else:
                     _set_color = None
+                if color_is_set and flow_type is not None and _set_alpha:
+                    _kwargs['alpha'] = _set_alpha.get(
+                            flow_type, _set_alpha.get(
+                                'default',
+                                self.default_alpha
+                                )
+                            )
             if color_is_set:
                 _kwargs[_color] = from_cluster.patch_kwargs.get(
                     _color, None
@@ -168,98 +385,99 @@ class Flux(object):
         # line below is probably not needed as alpha is set with the color
         _kwargs['alpha'] = _kwargs.get('alpha', self.default_alpha)
         # set in/out only flux styling
-        _in_kwargs = dict(_kwargs)
-        _in_kwargs.update(_to_in_kwargs)
-        _out_kwargs = dict(_kwargs)
-        _out_kwargs.update(_to_out_kwargs)
+        if self.out_loc is not None:
+            if self.in_loc is None:
+                _kwargs.update(_to_out_kwargs)
+                _kwargs.update(self._out_kwargs)
+        else:
+            if self.in_loc is not None:
+                _kwargs.update(_to_in_kwargs)
+                _kwargs.update(self._in_kwargs)
+            else:
+                raise Exception('Flux with neither source nor target cluster')
+        return _kwargs
+
+    def get_path(self):
+        r"""
+        Create the path outlining this flux.
 
+        Returns
+        --------
+        path: :class:`~matplotlib.path.Path`
+          Closed path from the source to the target cluster.
+
+        """
         _dist = None
         if self.out_loc is not None:
             if self.in_loc is not None:
                 _dist = 2/3 * (
-                        self.target_cluster.in_['bottom'][0] -
-                        self.source_cluster.out_['bottom'][0]
+                        self.target_cluster.in_[BOTTOM][0] -
+                        self.source_cluster.out_[BOTTOM][0]
                         )
             else:
                 _dist = 2 * self.source_cluster.width
-                _kwargs = _out_kwargs
         else:
-            if self.in_loc is not None:
-                _kwargs = _in_kwargs
-            else:
+            if self.in_loc is None:
                 raise Exception('Flux with neither source nor target cluster')
 
+        anchor_out, top_out = self.anchor_out, self.top_out
+        anchor_in, top_in = self.anchor_in, self.top_in
         # now complete the path points
-        if self.anchor_out is not None:
-            anchor_out_inner = (
-                self.anchor_out[0] - 0.5 * self.source_cluster.width,
-                self.anchor_out[1]
-            )
-            dir_out_anchor = (self.anchor_out[0] + _dist, self.anchor_out[1])
+        if anchor_out is not None or top_out is not None:
+            _out_inner = 0.5 * self.source_cluster.width
+        if anchor_in is not None or top_in is not None:
+            _in_inner = 0.5 * self.target_cluster.width
+        if anchor_out is not None:
+            out_x, out_y = anchor_out
+            anchor_out_inner = (out_x - _out_inner, out_y)
+            dir_out_anchor = (out_x + _dist, out_y)
         else:
             # TODO set to form vanishing flux
             # anchor_out = anchor_out_inner =
             # dir_out_anchor =
             pass
-        if self.top_out is not None:
-            top_out_inner = (
-                self.top_out[0] - 0.5 * self.source_cluster.width,
-                self.top_out[1]
-            )
+        if top_out is not None:
+            out_x, out_y = top_out
+            top_out_inner = (out_x - _out_inner, out_y)
             # 2nd point 2/3 of distance between clusters
-            dir_out_top = (self.top_out[0] + _dist, self.top_out[1])
+            dir_out_top = (out_x + _dist, out_y)
         else:
             # TODO set to form vanishing flux
             # top_out = top_out_inner =
             # dir_out_top =
             pass
-        if self.anchor_in is not None:
-            anchor_in_inner = (
-                self.anchor_in[0] + 0.5 * self.target_cluster.width,
-                self.anchor_in[1]
-            )
-            dir_in_anchor = (self.anchor_in[0] - _dist, self.anchor_in[1])
+        if anchor_in is not None:
+            in_x, in_y = anchor_in
+            anchor_in_inner = (in_x + _in_inner, in_y)
+            dir_in_anchor = (in_x - _dist, in_y)
         else:
             # TODO set to form new in flux
             # anchor_in = anchor_in_inner =
             # dir_in_anchor =
             pass
-        if self.top_in is not None:
-            top_in_inner = (
-                self.top_in[0] + 0.5 * self.target_cluster.width,
-                self.top_in[1]
-            )
-            dir_in_top = (self.top_in[0] - _dist, self.top_in[1])
+        if top_in is not None:
+            in_x, in_y = top_in
+            top_in_inner = (in_x + _in_inner, in_y)
+            dir_in_top = (in_x - _dist, in_y)
         else:
             # TODO set to form new in flux
             # top_in = top_in_inner =
             # dir_in_top =
             pass
 
-        vertices = [
-                self.anchor_out,
-                dir_out_anchor, dir_in_anchor, self.anchor_in,
-                anchor_in_inner, top_in_inner, self.top_in,
-                dir_in_top, dir_out_top, self.top_out,
-                top_out_inner, anchor_out_inner,
-                self.anchor_out
-                ]
-        codes = [
-                Path.MOVETO,
-                Path.CURVE4, Path.CURVE4, Path.CURVE4,
-                Path.LINETO, Path.LINETO, Path.LINETO,
-                Path.CURVE4, Path.CURVE4, Path.CURVE4,
-                Path.LINETO, Path.LINETO,
-                Path.CLOSEPOLY
-                ]
-        _path = Path(
-                vertices, codes,
+        # a flat sequence of coordinates converts faster than 2-tuples
+        vertices = np.array(
+                anchor_out +
+                dir_out_anchor + dir_in_anchor + anchor_in +
+                anchor_in_inner + top_in_inner + top_in +
+                dir_in_top + dir_out_top + top_out +
+                top_out_inner + anchor_out_inner +
+                anchor_out,
+                dtype=float
+                ).reshape(13, 2)
+        return Path(
+                vertices, _FLUX_CODES,
                 self._interp_steps,
                 self.closed,
                 self.readonly
                 )
-
-        flux_patch = patches.PathPatch(
-                _path, **_kwargs
-                )
-        return flux_patch
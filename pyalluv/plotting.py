@@ -1,9 +1,118 @@
 from __future__ import division, absolute_import, unicode_literals
-from matplotlib.collections import PatchCollection
-import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import Collection, PathCollection
+from matplotlib.path import Path
+import matplotlib.patches as patches
+import matplotlib.cm as cm
 import matplotlib.dates as mdates
-from datetime import datetime
-from bisect import bisect_left
+from datetime import datetime, timedelta
+
+from .clusters import _RECT_CODES
+from .fluxes import Flux
+
+
+def _timedelta_to_days(timedeltas, clusters):
+    r"""
+    Convert a sequence of :class:`~datetime.timedelta` objects to days.
+
+    Parameters
+    -----------
+    timedeltas: list[:class:`~datetime.timedelta`]
+      The durations to convert.
+    clusters: list[:class:`~pyalluv.clusters.Cluster`]
+      The cluster each duration belongs to, named if a duration is not a
+      :class:`~datetime.timedelta`.
+
+    Returns
+    --------
+    days: list
+      The duration of each timedelta in days as float, same as
+      ``timedelta.total_seconds()/60/60/24``.
+    """
+    days = []
+    for td, cluster in zip(timedeltas, clusters):
+        if not isinstance(td, timedelta):
+            raise TypeError(
+                    "Cluster '{}' is on a date axis and needs a "
+                    "datetime.timedelta, not {!r}".format(cluster.label, td)
+                    )
+        days.append(td.total_seconds()/60/60/24)
+    return days
+
+
+def _weighted_mean(weights, positions):
+    r"""
+    Return the weighted mean of positions.
+    """
+    return sum(
+            [weight * position for weight, position in zip(weights, positions)]
+            ) / sum(weights)
+
+
+def _weighted_absdiff(weights, positions, mid_height, sum_weights):
+    r"""
+    Return the weighted mean of the absolute distances between positions
+    and mid_height.
+    """
+    return sum(
+            [weight * abs(mid_height - position)
+                for weight, position in zip(weights, positions)]
+            ) / sum_weights
+
+
+def _get_collection_styling(patch_kwargs):
+    r"""
+    Translate the styling of individual patches to a collection.
+
+    This produces the same styling a
+    :class:`~matplotlib.collections.PatchCollection` with
+    ``match_original=True`` would, without creating a patch per element: each
+    distinct set of keyword arguments is resolved only once.
+
+    Parameters
+    -----------
+    patch_kwargs: list[dict]
+      Keyword arguments of a :class:`~matplotlib.patches.PathPatch` for each
+      element of the collection.
+
+    Returns
+    --------
+    collection_kwargs: dict
+      Holds per element `facecolors`, `edgecolors`, `linewidths`,
+      `linestyles` and `antialiaseds`.
+    """
+    resolved = {}
+    styling = []
+    for _kwargs in patch_kwargs:
+        try:
+            key = tuple(sorted(_kwargs.items()))
+            style = resolved.get(key)
+        except TypeError:
+            # unhashable values, e.g. a color given as a list
+            key, style = None, None
+        if style is None:
+            # the styling only, the path itself is not needed
+            patch = patches.PathPatch(None, **_kwargs)
+            style = (
+                patch.get_facecolor() if patch.get_fill() else (0, 0, 0, 0),
+                patch.get_edgecolor(),
+                patch.get_linewidth(),
+                patch.get_linestyle(),
+                patch.get_antialiased()
+                )
+            if key is not None:
+                resolved[key] = style
+        styling.append(style)
+    facecolors, edgecolors, linewidths, linestyles, antialiaseds = zip(
+            *styling
+            ) if styling else ([], [], [], [], [])
+    return {
+            'facecolors': list(facecolors),
+            'edgecolors': list(edgecolors),
+            'linewidths': list(linewidths),
+            'linestyles': list(linestyles),
+            'antialiaseds': list(antialiaseds)
+            }
 
 
 class AlluvialPlot(object):
@@ -131,6 +240,12 @@ class AlluvialPlot(object):
         redistribute_vertically: int (default=4)
           how often the vertical pairwise swapping of clusters at a given time
           point should be performed.
+        strict_swap: bool (default=True)
+          If set to `True` clusters are reordered by repeated pairwise
+          swapping. If set to `False` the clusters of a given time point are
+          instead sorted once by the weighted mean position of the clusters
+          they are connected to, which is considerably faster for many
+          clusters but can result in a different layout.
         y_offset: float
           offsets the vertical position of each cluster by this amount.
 
@@ -158,6 +273,7 @@ class AlluvialPlot(object):
             'redistribute_vertically',
             4
         )
+        self._strict_swap = kwargs.get('strict_swap', True)
         self.with_cluster_labels = kwargs.get('with_cluster_labels', True)
         self.format_xaxis = kwargs.get('format_xaxis', True)
         self._cluster_kwargs = cluster_kwargs
@@ -178,11 +294,6 @@ class AlluvialPlot(object):
                 except KeyError:
                     self.clusters[cluster.x_pos] = [cluster]
         self.x_positions = sorted(self.clusters.keys())
-        # set the x positions correctly for the clusters
-        if self._set_x_pos:
-            for x_pos in self.x_positions:
-                for cluster in self.clusters[x_pos]:
-                    cluster = cluster.set_x_pos(x_pos)
         self._x_dates = False
         _minor_tick = 'months'
         cluster_widths = []
@@ -196,39 +307,74 @@ class AlluvialPlot(object):
             self._x_dates = True
             if (self.x_positions[-1] - self.x_positions[0]).days < 2*30:
                 _minor_tick = 'weeks'
-            self.clusters = {
-                    mdates.date2num(x_pos): self.clusters[x_pos]
-                    for x_pos in self.x_positions
-                    }
+            # convert all dates in one go
+            self.clusters = dict(
+                    zip(
+                        mdates.date2num(self.x_positions).tolist(),
+                        [self.clusters[x_pos] for x_pos in self.x_positions]
+                        )
+                    )
             self.x_positions = sorted(self.clusters.keys())
-            for x_pos in self.x_positions:
-                for cluster in self.clusters[x_pos]:
-                    # in days (same as mdates.date2num)
-                    cluster.width = cluster.width.total_seconds()/60/60/24
-                    cluster_widths.append(cluster.width)
-                    if cluster.label_margin is not None:
-                        _h_margin = cluster.label_margin[
-                                0].total_seconds()/60/60/24
-                        cluster.label_margin = (
-                                _h_margin, cluster.label_margin[1]
-                                )
-                    cluster.set_x_pos(mdates.date2num(cluster.x_pos))
+            _clusters = [
+                    cluster
+                    for x_pos in self.x_positions
+                    for cluster in self.clusters[x_pos]
+                    ]
+            # in days (same as mdates.date2num)
+            _widths = _timedelta_to_days(
+                    [cluster.width for cluster in _clusters], _clusters
+                    )
+            if self._set_x_pos:
+                # set the x positions correctly for the clusters
+                for cluster, width, x_num in zip(
+                        _clusters, _widths,
+                        [
+                            x_pos for x_pos in self.x_positions
+                            for _ in self.clusters[x_pos]
+                            ]):
+                    cluster.width = width
+                    cluster_widths.append(width)
+                    cluster.set_x_pos(x_num)
+            else:
+                # the clusters are already anchored, only convert
+                _x_nums = mdates.date2num(
+                        [cluster.x_pos for cluster in _clusters]
+                        )
+                for cluster, width, x_num in zip(
+                        _clusters, _widths, _x_nums.tolist()):
+                    cluster.width = width
+                    cluster_widths.append(width)
+                    cluster.x_pos = x_num
+            _labelled = [
+                    cluster for cluster in _clusters
+                    if cluster.label_margin is not None
+                    ]
+            _h_margins = _timedelta_to_days(
+                    [cluster.label_margin[0] for cluster in _labelled],
+                    _labelled
+                    )
+            for cluster, _h_margin in zip(_labelled, _h_margins):
+                cluster.label_margin = (_h_margin, cluster.label_margin[1])
 
         # TODO: set the cluster.width property
         else:
             for x_pos in self.x_positions:
                 for cluster in self.clusters[x_pos]:
+                    # set the x positions correctly for the clusters
+                    if self._set_x_pos:
+                        cluster.set_x_pos(x_pos)
                     cluster_widths.append(cluster.width)
         self.cluster_width = kwargs.get('cluster_width', None)
         self.cluster_w_spacing = cluster_w_spacing
+        min_width = min(cluster_widths)
         self.x_lim = kwargs.get(
                 'x_lim',
                 (
                     self.x_positions[0]
-                    - 2 * min(cluster_widths),
+                    - 2 * min_width,
                     # - 2 * self.clusters[self.x_positions[0]][0].width,
                     self.x_positions[-1]
-                    + 2 * min(cluster_widths),
+                    + 2 * min_width,
                     # + 2 * self.clusters[self.x_positions[-1]][0].width,
                     )
                 )
@@ -240,43 +386,43 @@ class AlluvialPlot(object):
             for x_pos in self.x_positions:
                 self._move_new_clusters(x_pos)
             for x_pos in self.x_positions:
-                nbr_clusters = len(self.clusters[x_pos])
-                for _ in range(nbr_clusters):
-                    for i in range(1, nbr_clusters):
-                        n1 = self.clusters[x_pos][nbr_clusters-i-1]
-                        n2 = self.clusters[x_pos][nbr_clusters-i]
-                        if self._swap_clusters(n1, n2, 'forwards'):
-                            n2.set_y_pos(n1.y_pos)
-                            n1.set_y_pos(
-                                    n2.y_pos + n2.height +
-                                    self.cluster_w_spacing
-                                    )
-                            self.clusters[x_pos][nbr_clusters-i] = n1
-                            self.clusters[x_pos][nbr_clusters-i-1] = n2
+                if self._strict_swap:
+                    nbr_clusters = len(self.clusters[x_pos])
+                    flux_weights = self._get_column_flux_weights(
+                            x_pos, 'forwards'
+                            )
+                    # without out-fluxes no swap can reduce displacement
+                    if not any(w for w, _ in flux_weights.values()):
+                        continue
+                    for _ in range(nbr_clusters):
+                        self._swap_pass(
+                                x_pos, 'forwards', flux_weights, reverse=True
+                                )
+                else:
+                    self._sort_clusters(x_pos, 'forwards')
         else:
             # TODO: keep and complement
             pass
         if isinstance(self.y_fix, dict):
-            # TODO: allow to directly get the index given the cluster label
             for x_pos in self.y_fix:
-                for st in self.y_fix[x_pos]:
-                    n1_idx, n2_idx = (
-                            i for i, l in enumerate(
-                                map(
-                                    lambda x: x.label,
-                                    self.clusters[x_pos])
-                                )
-                            if l in st
-                            )
-                    self.clusters[
-                            x_pos][n1_idx], self.clusters[
-                                    x_pos][n2_idx] = self.clusters[
-                                            x_pos][n2_idx], self.clusters[
-                                                    x_pos][n1_idx]
-                    self._distribute_column(x_pos, self.cluster_w_spacing)
+                clusters = self.clusters[x_pos]
+                label_idx = {
+                        cluster.label: i for i, cluster in enumerate(clusters)
+                        }
+                for label1, label2 in self.y_fix[x_pos]:
+                    n1_idx, n2_idx = label_idx[label1], label_idx[label2]
+                    clusters[n1_idx], clusters[n2_idx] = \
+                        clusters[n2_idx], clusters[n1_idx]
+                    label_idx[label1], label_idx[label2] = n2_idx, n1_idx
+                # the positions only depend on the final order
+                self._distribute_column(x_pos, self.cluster_w_spacing)
 
         # positions are set
         self.y_lim = kwargs.get('y_lim', (self.y_min, self.y_max))
+        if self.y_offset:
+            for x_pos in self.x_positions:
+                for cluster in self.clusters[x_pos]:
+                    cluster.set_y_pos(cluster.y_pos + self.y_offset)
         # set the colors
         # TODO
 
@@ -287,10 +433,11 @@ class AlluvialPlot(object):
         )
         axes.add_collection(patch_collection)
         if self.with_cluster_labels:
-            label_collection = self.get_labelcollection(**label_kwargs)
-            if label_collection:
-                for label in label_collection:
-                    axes.annotate(**label)
+            labels, positions, _label_kwargs = self._get_labels(
+                    **label_kwargs
+                    )
+            for label, xy in zip(labels, positions):
+                axes.annotate(label, xy, **_label_kwargs)
         axes.set_xlim(
                 *self.x_lim
                 )
@@ -328,6 +475,10 @@ class AlluvialPlot(object):
           This must be a `key` of the :attr:`~.AlluvialPlot.clusters`
           attribute.
         """
+        # gather the flux widths once, they do not change while the clusters
+        # get moved around
+        for cluster in self.clusters[x_pos]:
+            cluster.set_flux_weights()
         nbr_clusters = len(self.clusters[x_pos])
         if nbr_clusters:
             # sort clusters according to height
@@ -345,37 +496,23 @@ class AlluvialPlot(object):
             _redistribute = False
             for _ in range(self._redistribute_vertically):
                 for cluster in self.clusters[x_pos]:
-                    weights = []
-                    positions = []
-                    for in_flux in cluster.in_fluxes:
-                        if in_flux.source_cluster is not None:
-                            weights.append(in_flux.flux_width)
-                            positions.append(in_flux.source_cluster.mid_height)
+                    weights, positions = self._get_flux_weights(
+                            cluster, 'backwards'
+                            )
                     if sum(weights) > 0.0:
                         _redistribute = True
                         cluster.set_mid_height(
-                                sum(
-                                    [weights[i] * positions[i]
-                                        for i in range(len(weights))]
-                                    ) / sum(weights)
+                                _weighted_mean(weights, positions)
                                 )
                 if _redistribute:
-                    sort_key = [
-                        bisect_left(
-                            old_mid_heights, self.clusters[x_pos][i].mid_height
-                        ) for i in range(nbr_clusters)
-                    ]
-                    cs, _sort_key = zip(
-                        *sorted(
-                            zip(
-                                list(range(nbr_clusters)),
-                                sort_key,
-                            ),
-                            key=lambda x: x[1]
-                        )
+                    sort_key = np.searchsorted(
+                        old_mid_heights,
+                        [_cluster.mid_height
+                         for _cluster in self.clusters[x_pos]]
                     )
                     self.clusters[x_pos] = [
-                        self.clusters[x_pos][_k] for _k in cs
+                        self.clusters[x_pos][_k]
+                        for _k in np.argsort(sort_key, kind='stable')
                     ]
                     # redistribute them
                     self._distribute_column(x_pos, self.cluster_w_spacing)
@@ -385,37 +522,27 @@ class AlluvialPlot(object):
                 else:
                     break
             # perform pairwise swapping for backwards fluxes
-            for _ in range(int(0.5 * nbr_clusters)):
-                for i in range(1, nbr_clusters):
-                    n1, n2 = self.clusters[x_pos][i-1], self.clusters[x_pos][i]
-                    if self._swap_clusters(n1, n2, 'backwards'):
-                        n2.set_y_pos(n1.y_pos)
-                        n1.set_y_pos(
-                                n2.y_pos + n2.height + self.cluster_w_spacing
-                                )
-                        self.clusters[x_pos][i-1] = n2
-                        self.clusters[x_pos][i] = n1
-            for _ in range(int(0.5 * nbr_clusters)):
-                for i in range(1, nbr_clusters):
-                    n1 = self.clusters[x_pos][nbr_clusters-i-1]
-                    n2 = self.clusters[x_pos][nbr_clusters-i]
-                    if self._swap_clusters(n1, n2, 'backwards'):
-                        n2.set_y_pos(n1.y_pos)
-                        n1.set_y_pos(
-                                n2.y_pos + n2.height + self.cluster_w_spacing
+            if self._strict_swap:
+                flux_weights = self._get_column_flux_weights(
+                        x_pos, 'backwards'
+                        )
+                # without in-fluxes no swap can reduce displacement
+                if any(w for w, _ in flux_weights.values()):
+                    for _ in range(int(0.5 * nbr_clusters)):
+                        self._swap_pass(x_pos, 'backwards', flux_weights)
+                    for _ in range(int(0.5 * nbr_clusters)):
+                        self._swap_pass(
+                                x_pos, 'backwards', flux_weights,
+                                reverse=True
                                 )
-                        self.clusters[x_pos][nbr_clusters-i-1] = n2
-                        self.clusters[x_pos][nbr_clusters-i] = n1
-
-            _min_y = min(
-                    self.clusters[x_pos], key=lambda x: x.y_pos
-                    ).y_pos - 2 * self.cluster_w_spacing
-            _max_y_cluster = max(
-                    self.clusters[x_pos],
-                    key=lambda x: x.y_pos + x.height
-                    )
-            _max_y = _max_y_cluster.y_pos + \
-                _max_y_cluster.height + 2 * self.cluster_w_spacing
+            else:
+                self._sort_clusters(x_pos, 'backwards')
+
+            # the clusters are stacked bottom to top
+            _min_y = self.clusters[x_pos][0].y_pos \
+                - 2 * self.cluster_w_spacing
+            _max_y = self.clusters[x_pos][-1].y_top \
+                + 2 * self.cluster_w_spacing
             self.y_min = min(
                 self.y_min,
                 _min_y
@@ -466,72 +593,125 @@ class AlluvialPlot(object):
             ax.xaxis.set_major_locator(months)
             ax.xaxis.set_major_formatter(monthsFmt)
 
-    def _swap_clusters(self, n1, n2, direction='backwards'):
-        squared_diff = {}
-        for cluster in [n1, n2]:
-            weights = []
-            sqdiff = []
-            if direction in ['both', 'backwards']:
-                for in_flux in cluster.in_fluxes:
-                    if in_flux.source_cluster is not None:
-                        weights.append(in_flux.flux_width)
-                        sqdiff.append(
-                                abs(
-                                    cluster.mid_height -
-                                    in_flux.source_cluster.mid_height
-                                    )
-                                )
-            if direction in ['both', 'forwards']:
-                for out_flux in cluster.out_fluxes:
-                    if out_flux.target_cluster is not None:
-                        weights.append(out_flux.flux_width)
-                        sqdiff.append(
-                                abs(
-                                    cluster.mid_height -
-                                    out_flux.target_cluster.mid_height
-                                    )
-                                )
-            if sum(weights) > 0.0:
-                squared_diff[cluster] = sum(
-                            [weights[i] * sqdiff[i]
-                                for i in range(len(weights))]
-                            ) / sum(weights)
-        # inverse order and check again
+    @staticmethod
+    def _get_flux_weights(cluster, direction='backwards'):
+        r"""
+        Return the widths of the fluxes of a cluster along with the vertical
+        positions of the clusters at their other end.
+
+        Parameters
+        -----------
+        cluster: :class:`.Cluster`
+          The cluster for which to get the flux weights.
+        direction: str (default='backwards')
+          Either 'backwards' for in-fluxes, 'forwards' for out-fluxes or
+          'both'.
+        """
+        if direction == 'backwards':
+            weights, others = cluster.in_weights, cluster.in_sources
+        elif direction == 'forwards':
+            weights, others = cluster.out_weights, cluster.out_targets
+        else:
+            weights = cluster.in_weights + cluster.out_weights
+            others = cluster.in_sources + cluster.out_targets
+        return weights, [other.mid_height for other in others]
+
+    def _get_column_flux_weights(self, x_pos, direction='backwards'):
+        r"""
+        Return for each cluster at a horizontal position the output of
+        :meth:`~.AlluvialPlot._get_flux_weights`.
+
+        While the clusters of a single horizontal position are swapped, the
+        clusters they are connected to do not move, so this can be used for
+        all swaps within this position.
+        """
+        return {
+                cluster: self._get_flux_weights(cluster, direction)
+                for cluster in self.clusters[x_pos]
+                }
+
+    def _get_desired_mid_height(self, cluster, direction='backwards'):
+        r"""
+        Return the flux weighted mean of the vertical positions of the
+        clusters a cluster is connected to.
+
+        If the cluster has no fluxes in the given direction its current
+        :attr:`~.Cluster.mid_height` is returned.
+        """
+        weights, positions = self._get_flux_weights(cluster, direction)
+        if sum(weights) > 0.0:
+            return _weighted_mean(weights, positions)
+        return cluster.mid_height
+
+    def _sort_clusters(self, x_pos, direction='backwards'):
+        r"""
+        Sort the clusters at a horizontal position by their desired vertical
+        position and redistribute them.
+
+        This replaces the pairwise swapping if `strict_swap` is set to
+        `False`.
+        """
+        self.clusters[x_pos].sort(
+                key=lambda x: self._get_desired_mid_height(x, direction)
+                )
+        self._distribute_column(x_pos, self.cluster_w_spacing)
+
+    def _swap_pass(self, x_pos, direction, flux_weights, reverse=False):
+        r"""
+        Go once through the clusters at a horizontal position and swap
+        neighbouring clusters whenever this reduces the flux displacement.
+
+        Parameters
+        -----------
+        x_pos: float
+          The horizontal position of the clusters to swap.
+        direction: str
+          Passed on to :meth:`~.AlluvialPlot._swap_clusters`.
+        flux_weights: dict
+          As returned by :meth:`~.AlluvialPlot._get_column_flux_weights`.
+        reverse: bool (default=False)
+          If `True` go from the last to the first cluster.
+        """
+        clusters = self.clusters[x_pos]
+        spacing = self.cluster_w_spacing
+        swap_clusters = self._swap_clusters
+        if reverse:
+            indices = range(len(clusters) - 1, 0, -1)
+        else:
+            indices = range(1, len(clusters))
+        for i in indices:
+            n1 = clusters[i-1]
+            n2 = clusters[i]
+            if swap_clusters(n1, n2, direction, flux_weights):
+                n2.set_y_pos(n1.y_pos)
+                n1.set_y_pos(n2.y_top + spacing)
+                clusters[i-1] = n2
+                clusters[i] = n1
+
+    def _swap_clusters(self, n1, n2, direction='backwards', flux_weights=None):
         assert n1.y_pos < n2.y_pos
+        # mid heights in inverse order
         inv_mid_height = {
-            n1: n2.y_pos + n2.height + self.cluster_w_spacing
+            n1: n2.y_top + self.cluster_w_spacing
             + 0.5 * n1.height,
             n2: n1.y_pos + 0.5 * n2.height
             }
+        squared_diff = {}
         squared_diff_inf = {}
         for cluster in [n1, n2]:
-            weights = []
-            sqdiff = []
-            if direction in ['both', 'backwards']:
-                for in_flux in cluster.in_fluxes:
-                    if in_flux.source_cluster is not None:
-                        weights.append(in_flux.flux_width)
-                        sqdiff.append(
-                                abs(
-                                    inv_mid_height[cluster] -
-                                    in_flux.source_cluster.mid_height
-                                    )
-                                )
-            if direction in ['both', 'forwards']:
-                for out_flux in cluster.out_fluxes:
-                    if out_flux.target_cluster is not None:
-                        weights.append(out_flux.flux_width)
-                        sqdiff.append(
-                                abs(
-                                    inv_mid_height[cluster] -
-                                    out_flux.target_cluster.mid_height
-                                    )
-                                )
-            if sum(weights) > 0.0:
-                squared_diff_inf[cluster] = sum(
-                            [weights[i] * sqdiff[i]
-                                for i in range(len(weights))]
-                            ) / sum(weights)
+            if flux_weights is None:
+                weights, positions = self._get_flux_weights(cluster, direction)
+            else:
+                weights, positions = flux_weights[cluster]
+            sum_weights = sum(weights)
+            if sum_weights > 0.0:
+                squared_diff[cluster] = _weighted_absdiff(
+                        weights, positions, cluster.mid_height, sum_weights
+                        )
+                squared_diff_inf[cluster] = _weighted_absdiff(
+                        weights, positions, inv_mid_height[cluster],
+                        sum_weights
+                        )
         if sum(squared_diff.values()) > sum(squared_diff_inf.values()):
             return True
         else:
@@ -554,42 +734,31 @@ class AlluvialPlot(object):
         influx but out fluxes. The clusters are moved closer (vertically) to
         the target clusters of the out flux(es).
         """
+        for cluster in self.clusters[x_pos]:
+            cluster.set_flux_weights()
         old_mid_heights = [
                 cluster.mid_height for cluster in self.clusters[x_pos]
                 ]
         _redistribute = False
         for cluster in self.clusters[x_pos]:
             if sum([_flux.flux_width for _flux in cluster.in_fluxes]) == 0.0:
-                weights = []
-                positions = []
-                for out_flux in cluster.out_fluxes:
-                    if out_flux.target_cluster is not None:
-                        weights.append(out_flux.flux_width)
-                        positions.append(out_flux.target_cluster.mid_height)
+                weights, positions = self._get_flux_weights(
+                        cluster, 'forwards'
+                        )
                 if sum(weights) > 0.0:
                     _redistribute = True
                     cluster.set_mid_height(
-                            sum(
-                                [weights[i] * positions[i]
-                                    for i in range(len(weights))]
-                                ) / sum(weights)
+                            _weighted_mean(weights, positions)
                             )
         if _redistribute:
-            sort_key = [
-                bisect_left(
-                    old_mid_heights, self.clusters[x_pos][i].mid_height
-                ) for i in range(len(self.clusters[x_pos]))
-            ]
-            cs, _sort_key = zip(
-                *sorted(
-                    zip(
-                        list(range(len(self.clusters[x_pos]))),
-                        sort_key,
-                    ),
-                    key=lambda x: x[1]
-                )
+            sort_key = np.searchsorted(
+                old_mid_heights,
+                [cluster.mid_height for cluster in self.clusters[x_pos]]
             )
-            self.clusters[x_pos] = [self.clusters[x_pos][_k] for _k in cs]
+            self.clusters[x_pos] = [
+                self.clusters[x_pos][_k]
+                for _k in np.argsort(sort_key, kind='stable')
+            ]
             # redistribute them
             self._distribute_column(x_pos, self.cluster_w_spacing)
 
@@ -602,118 +771,165 @@ class AlluvialPlot(object):
         """
         Gather the patchcollection to add to the axes
 
+        The paths of all fluxes and clusters are combined into a single
+        :class:`~matplotlib.collections.PathCollection`, fluxes first such
+        that clusters are drawn on top of them.
+
+        The fluxes are attached to the clusters on the first call and again
+        only once a cluster moved or got new fluxes.
+
         Parameter:
         ----------
+        :param match_original:
+            If `True` use the styling of each flux and cluster, otherwise the
+            styling provided in `kwargs` applies to the entire collection.
         :param kwargs:
-            Options:
+            Options passed on to
+            :class:`~matplotlib.collections.PathCollection`.
         """
-        cluster_patches = []
+        _clusters = []
+        cluster_vertices = []
+        cluster_styles = []
         fluxes = []
+        # a single moved cluster affects the fluxes of its neighbours too
+        reanchor = any(
+                cluster._flux_anchors_outdated
+                for x_pos in self.x_positions
+                for cluster in self.clusters[x_pos]
+                )
         for x_pos in self.x_positions:
-            out_fluxes = []
             for cluster in self.clusters[x_pos]:
                 # TODO: set color
                 # _cluster_color
-                cluster.set_y_pos(cluster.y_pos + self.y_offset)
-                cluster_patches.append(
-                            cluster.get_patch(
-                                **cluster_kwargs
-                                )
-                        )
-                # sort the fluxes for minimal overlap
-                cluster.set_loc_out_fluxes()
-                cluster.sort_in_fluxes()
-                cluster.sort_out_fluxes()
-                cluster.set_anchor_in_fluxes()
-                cluster.set_anchor_out_fluxes()
-                out_fluxes.extend(
-                        cluster.out_fluxes
-                        )
-            fluxes.append(out_fluxes)
-        flux_patches = []
-        for out_fluxes in fluxes:
-            for out_flux in out_fluxes:
-                flux_patches.append(
-                        out_flux.get_patch(
-                            **flux_kwargs
-                            )
+                _clusters.append(cluster)
+                cluster_vertices.append(cluster.get_vertices())
+                cluster_styles.append(
+                        cluster.get_patch_kwargs(**cluster_kwargs)
                         )
-        all_patches = []
-        all_patches.extend(flux_patches)
-        all_patches.extend(cluster_patches)
-        return PatchCollection(
-                all_patches,
-                match_original=match_original,
+                if reanchor:
+                    # sort the fluxes for minimal overlap
+                    cluster.set_loc_out_fluxes()
+                    cluster.sort_in_fluxes()
+                    cluster.sort_out_fluxes()
+                    cluster.set_anchor_in_fluxes()
+                    cluster.set_anchor_out_fluxes()
+                    cluster._flux_anchors_outdated = False
+                fluxes.extend(cluster.out_fluxes)
+        # convert the vertices of all clusters at once
+        cluster_vertices = np.array(cluster_vertices, dtype=float)
+        cluster_paths = [
+                Path(
+                    vertices, _RECT_CODES, cluster._interp_steps,
+                    cluster._closed, cluster._readonly
+                    )
+                for cluster, vertices in zip(_clusters, cluster_vertices)
+                ]
+        # the fluxes can only be drawn once all clusters set their anchors
+        flux_paths = Flux.get_paths(fluxes)
+        flux_styles = [flux.get_patch_kwargs(**flux_kwargs) for flux in fluxes]
+        if match_original:
+            kwargs.update(
+                    _get_collection_styling(flux_styles + cluster_styles)
+                    )
+        return PathCollection(
+                flux_paths + cluster_paths,
                 *args, **kwargs
                 )
 
     def get_labelcollection(self, *args, **kwargs):
+        r"""
+        Gather the keyword arguments to annotate each cluster with its label.
+
+        Returns
+        --------
+        cluster_labels: list
+          One `dict` per labelled cluster holding the `text`, `xy` and all
+          further `kwargs` to pass on to
+          :meth:`~matplotlib.axes.Axes.annotate`.
+        """
+        labels, positions, kwargs = self._get_labels(**kwargs)
+        return [
+                dict(kwargs, text=label, xy=xy)
+                for label, xy in zip(labels, positions)
+                ]
+
+    def _get_labels(self, **kwargs):
+        r"""
+        Return the labels of all clusters, their positions and the
+        keyword arguments shared by all labels.
+        """
         h_margin = kwargs.pop('h_margin', None)
         v_margin = kwargs.pop('v_margin', None)
         if 'horizontalalignment' not in kwargs:
             kwargs['horizontalalignment'] = 'right'
         if 'verticalalignment' not in kwargs:
             kwargs['verticalalignment'] = 'bottom'
-        cluster_labels = []
+        labels = []
+        positions = []
         for x_pos in self.x_positions:
             for cluster in self.clusters[x_pos]:
+                if cluster.label is None:
+                    continue
                 _h_margin = h_margin
                 _v_margin = v_margin
                 if cluster.label_margin:
                     _h_margin, _v_margin = cluster.label_margin
-                if cluster.label is not None:
-                    # # Options (example):
-                    # 'a polar annotation',
-                    # xy=(thistheta, thisr),  # theta, radius
-                    # xytext=(0.05, 0.05),    # fraction, fraction
-                    # textcoords='figure fraction',
-                    # arrowprops=dict(facecolor='black', shrink=0.05),
-                    cluster_label = {
-                            'text': cluster.label,
-                            'xy': (
-                                cluster.x_pos - _h_margin,
-                                cluster.y_pos + _v_margin
-                                )
-                            }
-                    cluster_label.update(kwargs)
-                    cluster_labels.append(cluster_label)
-        return cluster_labels
+                labels.append(cluster.label)
+                positions.append(
+                        (cluster.x_pos - _h_margin, cluster.y_pos + _v_margin)
+                        )
+        return labels, positions, kwargs
 
     def _distribute_column(self, x_pos, cluster_w_spacing):
-        displace = 0.0
+        # stack the clusters: each one starts where the previous ended
+        displace = []
+        _displace = 0.0
         for cluster in self.clusters[x_pos]:
-            cluster.set_y_pos(displace)
-            displace += cluster.height + cluster_w_spacing
+            displace.append(_displace)
+            _displace += cluster.height + cluster_w_spacing
         # now offset to center
-        low = self.clusters[x_pos][0].y_pos
-        high = self.clusters[x_pos][-1].y_pos + self.clusters[x_pos][-1].height
+        low = displace[0]
+        high = displace[-1] + self.clusters[x_pos][-1].height
         cent_offset = low + 0.5 * (high - low)
-        # _h_clusters = 0.5 * len(clusters)
-        # cent_idx = int(_h_clusters) - 1 \
-        #     if _h_clusters.is_integer() \
-        #     else int(_h_clusters)
-        # cent_offest = clusters[cent_idx].mid_height
-        for cluster in self.clusters[x_pos]:
-            cluster.set_y_pos(cluster.y_pos - cent_offset)
+        for cluster, y_pos in zip(self.clusters[x_pos], displace):
+            cluster.set_y_pos(y_pos - cent_offset)
 
-    def color_clusters(self, patches, colormap=plt.cm.rainbow):
+    def color_clusters(self, patches, colormap=cm.rainbow):
         r"""
         *unused*
 
         Parameters
         -----------
-        patches: list[:class:`~matplotlib.patches.PathPatch`]
-          Cluster patches to color.
+        patches: list[:class:`~matplotlib.patches.PathPatch`] or Collection
+          Cluster patches to color, face and edge get the same color. A
+          :class:`~matplotlib.collections.Collection` is colored with a single
+          call. Only its last paths, one per cluster of this plot, are
+          colored, such that the fluxes in the collection from
+          :meth:`get_patchcollection` keep their colors.
         colormap: :obj:`matplotlib.cm` (default='rainbow')
           See the matplotlib tutorial for colormaps
           (`link <https://matplotlib.org/tutorials/colors/colormaps.html>`_)
           for details.
 
         """
-        nbr_clusters = len(patches)
-        c_iter = iter(colormap([i/nbr_clusters for i in range(nbr_clusters)]))
-        for i in range(nbr_clusters):
-            _color = next(c_iter)
-            patches[i].set_facecolor(_color)
-            patches[i].set_edgecolor(_color)
+        if isinstance(patches, Collection):
+            nbr_paths = len(patches.get_paths())
+            nbr_clusters = min(
+                    nbr_paths,
+                    sum(len(clusters) for clusters in self.clusters.values())
+                    )
+        else:
+            nbr_clusters = len(patches)
+        colors = colormap(np.arange(nbr_clusters) / nbr_clusters)
+        if isinstance(patches, Collection):
+            # the collection repeats its colors to cover all paths
+            facecolors = np.resize(patches.get_facecolors(), (nbr_paths, 4))
+            edgecolors = np.resize(patches.get_edgecolors(), (nbr_paths, 4))
+            facecolors[nbr_paths - nbr_clusters:] = colors
+            edgecolors[nbr_paths - nbr_clusters:] = colors
+            patches.set_facecolor(facecolors)
+            patches.set_edgecolor(edgecolors)
+        else:
+            for patch, _color in zip(patches, colors):
+                patch.set_color(_color)
         return None
@@ -1,5 +1,8 @@
 from unittest import TestCase
-import pyalluv
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import pyplot as plt  # noqa: E402
+import pyalluv  # noqa: E402
 
 
 class TestObjectCreations(TestCase):
@@ -7,10 +10,268 @@ class TestObjectCreations(TestCase):
         node = pyalluv.Cluster(
                 height=10,
                 anchor=(0, 0),
-                widht=4,
+                width=4,
                 x_anchor='left',
                 label='test node',
                 label_margin=(1, 2)
                 )
         # make sure x_anchor works fine
         self.assertTrue(node.x_pos == 0)
+
+    def test_from_arrays(self):
+        clusters = pyalluv.Cluster.from_arrays(
+                heights=[3, 2],
+                labels=['a', 'b'],
+                facecolor=['C1', 'C2'],
+                )
+        self.assertEqual([c.height for c in clusters], [3, 2])
+        self.assertEqual([c.label for c in clusters], ['a', 'b'])
+        self.assertEqual(clusters[1].patch_kwargs['facecolor'], 'C2')
+        fluxes = pyalluv.Flux.from_arrays(
+                [1, 2],
+                source_clusters=clusters,
+                target_clusters=clusters[::-1],
+                facecolor='source_cluster',
+                )
+        self.assertEqual([f.flux_width for f in fluxes], [1, 2])
+        self.assertIs(fluxes[0].target_cluster, clusters[1])
+        self.assertEqual(clusters[0].out_fluxes, [fluxes[0]])
+
+    def test_from_arrays_broadcast(self):
+        # a tuple is used for all elements, a list per element
+        clusters = pyalluv.Cluster.from_arrays(
+                [3, 2, 1], facecolor=(1, 0, 0, 1)
+                )
+        self.assertEqual(
+                [c.patch_kwargs['facecolor'] for c in clusters],
+                [(1, 0, 0, 1)] * 3
+                )
+        with self.assertRaises(ValueError):
+            pyalluv.Cluster.from_arrays([3, 2, 1], facecolor=[1, 0, 0, 1])
+        fluxes = pyalluv.Flux.from_arrays(
+                [1, 2], edgecolor=(0, 0, 1), source_clusters=clusters[:2]
+                )
+        self.assertEqual(fluxes[1].patch_kwargs['edgecolor'], (0, 0, 1))
+        with self.assertRaises(ValueError):
+            pyalluv.Flux.from_arrays([1, 2], edgecolor=['C1'])
+        # too many or too few labels and clusters
+        for labels in (['a'], ['a', 'b', 'c', 'd']):
+            with self.assertRaises(ValueError):
+                pyalluv.Cluster.from_arrays([3, 2, 1], labels=labels)
+        with self.assertRaises(ValueError):
+            pyalluv.Flux.from_arrays([1, 2], source_clusters=clusters)
+        with self.assertRaises(ValueError):
+            pyalluv.Flux.from_arrays([1, 2], target_clusters=clusters[:1])
+        # a single number is no sequence
+        with self.assertRaises(ValueError):
+            pyalluv.Cluster.from_arrays(5)
+        with self.assertRaises(ValueError):
+            pyalluv.Flux.from_arrays(5)
+
+    def test_flux_in_out_kwargs(self):
+        cluster = pyalluv.Cluster(height=1, anchor=(0, 0))
+        flux = pyalluv.Flux(flux=1, source_cluster=cluster)
+        # a flux leaving the diagram
+        flux.out_loc, flux.in_loc = pyalluv.clusters.TOP, None
+        kwargs = flux.get_patch_kwargs(
+                out_facecolor='red', in_facecolor='blue'
+                )
+        self.assertEqual(kwargs['facecolor'], 'red')
+        self.assertNotIn('out_facecolor', kwargs)
+        # flux specific in/out styling takes precedence
+        flux = pyalluv.Flux(
+                flux=1, source_cluster=cluster, out_edgecolor='green'
+                )
+        flux.out_loc, flux.in_loc = pyalluv.clusters.TOP, None
+        kwargs = flux.get_patch_kwargs(out_edgecolor='red')
+        self.assertEqual(kwargs['edgecolor'], 'green')
+        self.assertNotIn('out_edgecolor', flux.patch_kwargs)
+
+
+class TestAlluvialPlot(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # share a single figure, creating one per test is slow
+        cls.fig, cls.ax = plt.subplots()
+
+    @classmethod
+    def tearDownClass(cls):
+        plt.close(cls.fig)
+
+    def setUp(self):
+        self.ax.cla()
+
+    def test_single_collection(self):
+        clusters = {
+                0: pyalluv.Cluster.from_arrays([2, 1], facecolor='red'),
+                1: pyalluv.Cluster.from_arrays([3], facecolor='blue'),
+                }
+        pyalluv.Flux.from_arrays(
+                [2, 1],
+                source_clusters=clusters[0],
+                target_clusters=clusters[1] * 2,
+                facecolor='target_cluster',
+                )
+        pyalluv.AlluvialPlot(clusters, self.ax)
+        self.assertEqual(len(self.ax.collections), 1)
+        collection = self.ax.collections[0]
+        # 2 fluxes followed by 3 clusters
+        self.assertEqual(len(collection.get_paths()), 5)
+        facecolors = collection.get_facecolors()
+        self.assertEqual(tuple(facecolors[0][:3]), (0.0, 0.0, 1.0))
+        self.assertEqual(tuple(facecolors[2]), (1.0, 0.0, 0.0, 1.0))
+
+    def test_no_strict_swap(self):
+        clusters = {
+                0: pyalluv.Cluster.from_arrays([1, 1, 1]),
+                1: pyalluv.Cluster.from_arrays([1, 1, 1]),
+                }
+        # connect the clusters in reversed order
+        sources, targets = clusters[0][:], clusters[1][::-1]
+        pyalluv.Flux.from_arrays(
+                [1, 1, 1],
+                source_clusters=sources,
+                target_clusters=targets,
+                )
+        pyalluv.AlluvialPlot(clusters, self.ax, strict_swap=False)
+        for source, target in zip(sources, targets):
+            self.assertEqual(source.y_pos, target.y_pos)
+
+    def test_flux_paths(self):
+        clusters = {
+                0: pyalluv.Cluster.from_arrays([2, 1]),
+                1: pyalluv.Cluster.from_arrays([1, 2]),
+                }
+        fluxes = pyalluv.Flux.from_arrays(
+                [1, 1, 1],
+                source_clusters=clusters[0] + clusters[0][:1],
+                target_clusters=clusters[1] + clusters[1][1:],
+                )
+        pyalluv.AlluvialPlot(clusters, self.ax)
+        for path, flux in zip(pyalluv.Flux.get_paths(fluxes), fluxes):
+            self.assertEqual(
+                    path.vertices.tolist(), flux.get_path().vertices.tolist()
+                    )
+
+    def test_y_offset(self):
+        vertices = []
+        for y_offset in [0, 5]:
+            clusters = {
+                    0: pyalluv.Cluster.from_arrays([1, 3]),
+                    1: pyalluv.Cluster.from_arrays([3, 1]),
+                    }
+            pyalluv.Flux.from_arrays(
+                    [1, 2, 1],
+                    source_clusters=clusters[0][:1] + clusters[0][1:] * 2,
+                    target_clusters=clusters[1] + clusters[1][:1],
+                    )
+            self.ax.cla()
+            pyalluv.AlluvialPlot(clusters, self.ax, y_offset=y_offset)
+            vertices.append(
+                    [p.vertices for p in self.ax.collections[0].get_paths()]
+                    )
+        # the whole diagram is shifted, fluxes included
+        for path, shifted_path in zip(*vertices):
+            self.assertEqual(
+                    (path + (0, 5)).tolist(), shifted_path.tolist()
+                    )
+
+    def test_date_x_positions(self):
+        from datetime import datetime, timedelta
+        import matplotlib.dates as mdates
+        dates = [datetime(2020, 1, 1), datetime(2020, 3, 1)]
+        clusters = {
+                date: pyalluv.Cluster.from_arrays(
+                    [1, 2], width=timedelta(days=4)
+                    )
+                for date in dates
+                }
+        pyalluv.AlluvialPlot(clusters, self.ax)
+        # the clusters are centered on their date
+        for date in dates:
+            for cluster in clusters[date]:
+                self.assertEqual(
+                        cluster.x_pos + 0.5 * cluster.width,
+                        mdates.date2num(date)
+                        )
+
+    def test_date_x_positions_int_width(self):
+        from datetime import datetime
+        # a plain number is no duration on a date axis
+        clusters = {
+                datetime(2020, 1, 1): pyalluv.Cluster.from_arrays(
+                    [1, 2], width=2
+                    )
+                }
+        with self.assertRaises(TypeError):
+            pyalluv.AlluvialPlot(clusters, self.ax)
+
+    def test_moved_cluster(self):
+        clusters = {
+                0: pyalluv.Cluster.from_arrays([1]),
+                1: pyalluv.Cluster.from_arrays([1]),
+                }
+        flux, = pyalluv.Flux.from_arrays(
+                [1],
+                source_clusters=clusters[0],
+                target_clusters=clusters[1],
+                )
+        plot = pyalluv.AlluvialPlot(clusters, self.ax)
+        plot.get_patchcollection()
+        target = clusters[1][0]
+        target.set_y_pos(target.y_pos + 5)
+        plot.get_patchcollection()
+        # the flux follows the moved cluster
+        self.assertEqual(flux.anchor_in, target.in_[0])
+        self.assertEqual(flux.top_in, target.in_[1])
+
+    def test_color_clusters(self):
+        import numpy as np
+        from matplotlib import cm
+        from matplotlib.patches import Rectangle
+        clusters = {
+                0: pyalluv.Cluster.from_arrays([1, 2], facecolor='C0'),
+                1: pyalluv.Cluster.from_arrays([3], facecolor='C0'),
+                }
+        pyalluv.Flux.from_arrays(
+                [1],
+                source_clusters=clusters[0][:1],
+                target_clusters=clusters[1],
+                facecolor='C1',
+                edgecolor='C1',
+                )
+        plot = pyalluv.AlluvialPlot(clusters, self.ax)
+        collection = plot.get_patchcollection()
+        flux_color = collection.get_facecolors()[0].copy()
+        plot.color_clusters(collection)
+        colors = cm.rainbow(np.arange(3) / 3)
+        # the flux comes first and keeps its color
+        np.testing.assert_array_equal(collection.get_facecolors()[1:], colors)
+        np.testing.assert_array_equal(collection.get_edgecolors()[1:], colors)
+        np.testing.assert_array_equal(
+                collection.get_facecolors()[0], flux_color
+                )
+        np.testing.assert_array_equal(
+                collection.get_edgecolors()[0], flux_color
+                )
+        rectangles = [Rectangle((0, 0), 1, 1) for _ in range(3)]
+        plot.color_clusters(rectangles)
+        for rectangle, color in zip(rectangles, colors):
+            self.assertEqual(rectangle.get_facecolor(), tuple(color))
+            self.assertEqual(rectangle.get_edgecolor(), tuple(color))
+
+    def test_distribute_kept_clusters(self):
+        source_low = pyalluv.Cluster(height=1, anchor=(0, 0))
+        source_high = pyalluv.Cluster(height=1, anchor=(0, 10))
+        target_a = pyalluv.Cluster(height=1, anchor=(1, 0))
+        target_b = pyalluv.Cluster(height=1, anchor=(1, 0))
+        plot = pyalluv.AlluvialPlot(
+                {0: [source_low, source_high], 1: [target_a, target_b]},
+                self.ax, y_pos='keep'
+                )
+        # a flux added after the plot was created is part of the layout
+        pyalluv.Flux(
+                flux=1, source_cluster=source_high, target_cluster=target_b
+                )
+        plot.distribute_clusters(1)
+        self.assertGreater(target_b.mid_height, target_a.mid_height)
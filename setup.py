@@ -11,8 +11,9 @@ setup(
         # version='0.1',
         # ####################################################################
         # ####################################################################
+        # setuptools_scm is provided by the build requirements, see
+        # pyproject.toml
         use_scm_version={'write_to': 'docs/version.txt'},
-        setup_requires=['setuptools_scm'],
         # ####################################################################
         # ####################################################################
         description='Drawing alluvial plots in matplotlib.',
@@ -31,9 +32,11 @@ setup(
         packages=['pyalluv'],
         install_requires=[
           'matplotlib',
+          'numpy',
         ],
-        test_suite='nose.collector',
-        tests_require=['nose', 'nose-cover3'],
+        extras_require={
+          'test': ['nose', 'nose-cover3'],
+        },
         # ToDo:
         # entry_points={
         #   'console_scripts': ['draw-alluvial=pyalluv.command_line:main'],